@@ -7,7 +7,7 @@ from src.data_loader import load_flights
 from src.features import add_time_features, compute_congestion, mark_peak_hours
 from src.analysis import busiest_slots, best_time_windows, runway_utilization
 from src.model_delay import train_delay_model
-from src.cascade import link_rotations, cascade_scores
+from src.cascade import link_rotations, cascade_scores, CascadeState
 from src.simulator import simulate_shift
 from app.nlp import intent_and_params
 
@@ -86,9 +86,27 @@ with tab4:
 
     flight = st.text_input("Flight number to shift (e.g., AI101)", "")
     shift = st.slider("Shift minutes", -120, 120, 15, step=5)
+    sim_apt = st.text_input("Airport for downstream impact (arrivals to / departures from)", "BOM", key="sim_apt")
+    # Keep the rotation graph across reruns so each what-if only touches the shifted flight's descendants;
+    # key on the data content and airport so a re-upload under the same name starts a fresh scenario
+    cascade_key = (int(pd.util.hash_pandas_object(df, index=True).sum()), sim_apt)
+    if st.session_state.get("cascade_key") != cascade_key:
+        st.session_state["cascade_state"] = CascadeState(df, link_rotations(df, airport=sim_apt))
+        st.session_state["cascade_key"] = cascade_key
+    if st.button("Reset scenario"):
+        st.session_state["cascade_state"].reset()
     if st.button("Simulate Shift") and flight:
         res = simulate_shift(df, "reports/delay_model.joblib", flight, shift_minutes=shift, by=by)
         st.json(res)
+        impact = st.session_state["cascade_state"].shift_flight(flight, shift)
+        if "error" not in impact:
+            st.write("Flights whose knock-on delay changed:", impact["downstream_flights"],
+                     "| Propagated delay change from this shift (min):", round(impact["propagated_minutes_change"], 1),
+                     "| Scenario-wide propagated delay, all shifts so far (min):", round(impact["scenario_propagated_minutes"], 1))
+            st.dataframe(pd.DataFrame(impact["impacts"]))
+            if impact["relieved"]:
+                st.write("Turns relieved since the previous shift:")
+                st.dataframe(pd.DataFrame(impact["relieved"]))
 
 with tab5:
     st.subheader("Cascade Impact")
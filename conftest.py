@@ -0,0 +1 @@
+# Keeps the repo root on sys.path so tests can import `src` under plain `pytest`.
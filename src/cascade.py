@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import networkx as nx
+from collections import defaultdict, deque
 
 def link_rotations(df: pd.DataFrame, airport: str = "BOM", max_turn_minutes: int = 240) -> pd.DataFrame:
     """Link arrivals into airport to next departure of same registration (best) or airline within a window.
@@ -63,3 +64,168 @@ def cascade_scores(df: pd.DataFrame, edges: pd.DataFrame) -> pd.DataFrame:
         "in_degree": [indeg.get(k, 0) for k in btw.keys()],
     }).sort_values(["betweenness","pagerank","out_degree"], ascending=False)
     return res
+
+class CascadeState:
+    """In-memory rotation graph for incremental what-if cascade analysis.
+
+    Built once from `link_rotations` edges; `shift_flight` then updates only the
+    turns touching the shifted flight and re-propagates delay only as far as it
+    actually changes, instead of relinking the whole schedule.
+    Propagated minutes are relative to the loaded schedule: a departure is pushed
+    back by however much its inbound turn falls further below `min_turn_minutes`.
+    """
+
+    def __init__(self, df: pd.DataFrame, edges: pd.DataFrame, min_turn_minutes: int = 30):
+        self.min_turn_minutes = float(min_turn_minutes)
+        self.G = nx.DiGraph()
+        self.G.add_nodes_from(df.get("flight_number", pd.Series([f"F{i}" for i in range(len(df))])).astype(str).tolist())
+        if not edges.empty:
+            # Flight numbers repeat daily, so keep the tightest turn per pair
+            turns = edges.assign(src=edges["src"].astype(str), dst=edges["dst"].astype(str)).groupby(["src", "dst"])["turn_minutes"].min()
+            for (src, dst), t in turns.items():
+                self.G.add_edge(src, dst, base_turn=float(t), turn_minutes=float(t))
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all shifts and return to the loaded schedule."""
+        for _, _, attrs in self.G.edges(data=True):
+            attrs["turn_minutes"] = attrs["base_turn"]
+        self.shift = {}        # flight -> scheduled shift (min) applied to its departure and arrival
+        self.propagated = {}   # flight -> knock-on departure delay (min) from inbound turns
+        self.total_propagated = 0.0
+        # flight -> inbound flight whose turn sets its delay; never cyclic since delay cannot grow around a loop
+        self.support = {}
+        self._supported = defaultdict(set)
+
+    def _shortfall(self, turn: float) -> float:
+        return max(0.0, self.min_turn_minutes - turn)
+
+    def _effective_turn(self, u, v) -> float:
+        return self.G[u][v]["turn_minutes"] - self.propagated.get(u, 0.0)
+
+    def _contribution(self, u, v) -> float:
+        return self._shortfall(self._effective_turn(u, v)) - self._shortfall(self.G[u][v]["base_turn"])
+
+    def _recompute(self, node):
+        prop, via = 0.0, None
+        for u in self.G.predecessors(node):
+            c = self._contribution(u, node)
+            if c > prop:
+                prop, via = c, u
+        return prop, via
+
+    def _set(self, node, value: float, via) -> None:
+        self.total_propagated += value - self.propagated.get(node, 0.0)
+        old_via = self.support.pop(node, None)
+        if old_via is not None:
+            self._supported[old_via].discard(node)
+        if value:
+            self.propagated[node] = value
+            self.support[node] = via
+            self._supported[via].add(node)
+        else:
+            self.propagated.pop(node, None)
+
+    def shift_flight(self, flight_number: str, shift_minutes: int) -> dict:
+        """Set a flight's shift from its loaded schedule and return the downstream impact.
+
+        Impacts list the turns around the flight, and along the chain of flights it
+        delays, that are shorter than in the loaded schedule, flagged "broken" below
+        the minimum turn; `relieved` lists turns that lengthened since the previous call.
+        """
+        f = str(flight_number)
+        if f not in self.G:
+            return {"error": f"Flight {flight_number} not found."}
+
+        delta = float(shift_minutes) - self.shift.get(f, 0.0)
+        self.shift[f] = float(shift_minutes)
+        old_total = self.total_propagated
+
+        before, old = {}, {}
+        def _touch(n):
+            # Record a flight's value and outbound turns before it first changes
+            if n not in old:
+                old[n] = self.propagated.get(n, 0.0)
+                for v in self.G.successors(n):
+                    before.setdefault((n, v), self._effective_turn(n, v))
+
+        # Only the turns touching the shifted flight change in the schedule itself
+        changed_edges = [(u, f) for u in self.G.predecessors(f)] + [(f, v) for v in self.G.successors(f)]
+        for u, v in changed_edges:
+            before.setdefault((u, v), self._effective_turn(u, v))
+        for u in self.G.predecessors(f):
+            self.G[u][f]["turn_minutes"] += delta
+        for v in self.G.successors(f):
+            self.G[f][v]["turn_minutes"] -= delta
+
+        # A flight whose supporting turn loosened, and everything it supports, drops
+        # back to zero; from there values only rise, so the worklist reaches the
+        # same least fixpoint a full recompute would
+        released = deque(v for u, v in changed_edges
+                         if self.support.get(v) == u and self._contribution(u, v) < self.propagated[v] - 1e-9)
+        seeds = [f] + list(self.G.successors(f))
+        while released:
+            n = released.popleft()
+            if n not in self.propagated:
+                continue
+            released.extend(self._supported[n])
+            _touch(n)
+            self._set(n, 0.0, None)
+            seeds.append(n)
+
+        queue, queued = deque(seeds), set(seeds)
+        while queue:
+            n = queue.popleft()
+            queued.discard(n)
+            new, via = self._recompute(n)
+            if new <= self.propagated.get(n, 0.0) + 1e-9:
+                continue
+            _touch(n)
+            self._set(n, new, via)
+            for v in self.G.successors(n):
+                if v not in queued:
+                    queue.append(v)
+                    queued.add(v)
+        changed = {n for n, was in old.items() if abs(self.propagated.get(n, 0.0) - was) > 1e-9}
+
+        # Report the touched turns plus the tightened turns along the chain of flights this one delays
+        scope = dict.fromkeys(before)
+        stack, seen = [f], {f}
+        while stack:
+            u = stack.pop()
+            for v in self.G.successors(u):
+                if self._effective_turn(u, v) < self.G[u][v]["base_turn"]:
+                    scope.setdefault((u, v))
+                if self._contribution(u, v) > 1e-9 and v not in seen:
+                    seen.add(v)
+                    stack.append(v)
+
+        impacts, relieved = [], []
+        for u, v in scope:
+            turn = self._effective_turn(u, v)
+            base = self.G[u][v]["base_turn"]
+            previous = before.get((u, v), turn)
+            if turn > previous:
+                relieved.append({"src": u, "dst": v, "turn_previous": previous, "turn_minutes": turn})
+            if turn >= base:
+                continue
+            impacts.append({
+                "src": u,
+                "dst": v,
+                "base_turn": base,
+                "turn_previous": previous,
+                "turn_minutes": turn,
+                "status": "broken" if turn < self.min_turn_minutes else "tightened",
+                "propagated_minutes": self.propagated.get(v, 0.0),
+            })
+        impacts.sort(key=lambda r: (r["status"] != "broken", -r["propagated_minutes"], r["turn_minutes"]))
+
+        return {
+            "flight_number": f,
+            "shift_minutes": int(shift_minutes),
+            "downstream_flights": len(changed - {f}),
+            "impacts": impacts,
+            "relieved": relieved,
+            "propagated_minutes_change": self.total_propagated - old_total,
+            "scenario_propagated_minutes": self.total_propagated,
+        }
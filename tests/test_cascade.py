@@ -0,0 +1,138 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src.cascade import CascadeState, link_rotations
+
+
+def _state(edges, min_turn=30):
+    e = pd.DataFrame([{"src": s, "dst": d, "turn_minutes": t} for s, d, t in edges])
+    nodes = sorted({s for s, _, _ in edges} | {d for _, d, _ in edges})
+    return CascadeState(pd.DataFrame({"flight_number": nodes}), e, min_turn_minutes=min_turn)
+
+
+def _full_recompute(edges, shifts, min_turn=30):
+    """Propagated minutes from scratch: least fixpoint over every edge."""
+    short = lambda t: max(0.0, min_turn - t)
+    prop = {}
+    changed = True
+    while changed:
+        changed = False
+        for v in {d for _, d, _ in edges}:
+            new = 0.0
+            for s, d, base in edges:
+                if d != v:
+                    continue
+                turn = base + shifts.get(d, 0) - shifts.get(s, 0) - prop.get(s, 0.0)
+                new = max(new, short(turn) - short(base))
+            if abs(new - prop.get(v, 0.0)) > 1e-9:
+                prop[v] = new
+                changed = True
+    return {k: v for k, v in prop.items() if v}
+
+
+def _check(state, edges, shifts):
+    expected = _full_recompute(edges, shifts, state.min_turn_minutes)
+    assert state.propagated == pytest.approx(expected)
+    assert state.total_propagated == pytest.approx(sum(expected.values()))
+
+
+CHAIN = [("A", "B", 40), ("B", "C", 35), ("C", "D", 90)]
+DIAMOND = [("A", "B", 35), ("A", "C", 60), ("B", "D", 32), ("C", "D", 31)]
+LOOP = [("f", "a", 40), ("f", "c", 100), ("a", "b", 35), ("b", "c", 31), ("c", "z", 200), ("z", "c", 200)]
+
+
+@pytest.mark.parametrize("edges, steps", [
+    (CHAIN, [("A", 30), ("A", 30), ("A", 0), ("B", -20), ("C", 50), ("A", 45)]),
+    (DIAMOND, [("A", 20), ("C", 40), ("A", -10), ("D", -15), ("A", 0)]),
+    (LOOP, [("f", 30), ("z", 190), ("f", 0), ("c", 20), ("z", 0)]),
+])
+def test_matches_full_recompute(edges, steps):
+    state = _state(edges)
+    shifts = {}
+    for flight, minutes in steps:
+        state.shift_flight(flight, minutes)
+        shifts[flight] = minutes
+        _check(state, edges, shifts)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_graphs_match_full_recompute(seed):
+    rng = random.Random(seed)
+    pairs = {(f"F{rng.randrange(30)}", f"F{rng.randrange(30)}"): rng.choice([0, 10, 30, 35, 40, 60]) for _ in range(60)}
+    edges = [(s, d, t) for (s, d), t in pairs.items()]
+    state = _state(edges)
+    shifts = {}
+    for _ in range(20):
+        flight, minutes = rng.choice(edges)[0], rng.choice([-60, -30, -10, 0, 10, 30, 60])
+        state.shift_flight(flight, minutes)
+        shifts[flight] = minutes
+        _check(state, edges, shifts)
+
+
+def test_loop_fixpoint():
+    state = _state(LOOP)
+    state.shift_flight("f", 30)
+    assert state.propagated["c"] == pytest.approx(14)
+
+
+def test_repeated_shift_reports_against_baseline():
+    state = _state(CHAIN)
+    first = state.shift_flight("A", 20)
+    second = state.shift_flight("A", 20)
+    assert [(r["src"], r["dst"], r["status"]) for r in second["impacts"]] == \
+        [(r["src"], r["dst"], r["status"]) for r in first["impacts"]]
+    assert ("A", "B", "broken") in [(r["src"], r["dst"], r["status"]) for r in second["impacts"]]
+    assert second["propagated_minutes_change"] == 0
+
+    undone = state.shift_flight("A", 0)
+    assert undone["impacts"] == []
+    assert ("A", "B") in [(r["src"], r["dst"]) for r in undone["relieved"]]
+    assert undone["scenario_propagated_minutes"] == 0
+
+
+def test_negative_shift_reports_inbound_turn():
+    state = _state(CHAIN)
+    res = state.shift_flight("B", -20)
+    assert state.propagated["B"] == pytest.approx(10)
+    assert res["propagated_minutes_change"] == pytest.approx(10)
+    broken = [(r["src"], r["dst"]) for r in res["impacts"] if r["status"] == "broken"]
+    assert ("A", "B") in broken
+
+
+def test_change_is_per_call_and_reset():
+    state = _state([("A", "B", 40), ("D", "E", 40)])
+    state.shift_flight("D", 40)
+    res = state.shift_flight("A", 30)
+    assert res["propagated_minutes_change"] == pytest.approx(20)
+    assert res["scenario_propagated_minutes"] == pytest.approx(50)
+    state.reset()
+    assert state.propagated == {} and state.total_propagated == 0
+    assert state.shift_flight("A", 0)["impacts"] == []
+
+
+def test_duplicate_pair_keeps_tightest_turn():
+    day = lambda d, hm: pd.Timestamp(f"2025-07-0{d} {hm}")
+    df = pd.DataFrame([
+        {"flight_number": "AI101", "registration": "VT-A", "origin": "DEL", "destination": "BOM", "actual_arrival_dt": day(1, "10:00"), "scheduled_departure_dt": day(1, "08:00")},
+        {"flight_number": "AI102", "registration": "VT-A", "origin": "BOM", "destination": "MAA", "actual_arrival_dt": day(1, "12:35"), "scheduled_departure_dt": day(1, "10:35")},
+        {"flight_number": "AI101", "registration": "VT-A", "origin": "DEL", "destination": "BOM", "actual_arrival_dt": day(2, "10:00"), "scheduled_departure_dt": day(2, "08:00")},
+        {"flight_number": "AI102", "registration": "VT-A", "origin": "BOM", "destination": "MAA", "actual_arrival_dt": day(2, "15:00"), "scheduled_departure_dt": day(2, "13:00")},
+    ])
+    edges = link_rotations(df, airport="BOM")
+    assert sorted(edges["turn_minutes"]) == [35, 180]
+    state = CascadeState(df, edges)
+    res = state.shift_flight("AI101", 10)
+    assert state.G["AI101"]["AI102"]["base_turn"] == 35
+    assert res["impacts"][0]["status"] == "broken"
+    assert state.propagated["AI102"] == pytest.approx(5)
+
+
+def test_absorbed_shift_stays_local():
+    n = 5000
+    state = _state([(f"F{i}", f"F{i + 1}", 200) for i in range(n)])
+    res = state.shift_flight("F0", 5)
+    assert res["downstream_flights"] == 0
+    assert res["propagated_minutes_change"] == 0
+    assert [(r["src"], r["dst"]) for r in res["impacts"]] == [("F0", "F1")]